@@ -2,12 +2,13 @@
 Health check routes for the Excel API.
 """
 
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, status
+from datetime import datetime, timezone
+from fastapi import APIRouter
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
-from app.models.health import HealthResponse, HealthData
+from app.core.responses import APIJSONResponse
+from app.models.health import HealthResponse
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -15,35 +16,55 @@ settings = get_settings()
 # Create health router
 router = APIRouter(prefix="/api", tags=["health"])
 
+# Pollers may reuse a health response briefly instead of hitting the API each time
+HEALTH_CACHE_CONTROL = "public, max-age=5"
 
-@router.get("/health", response_model=HealthResponse, summary="Health Check")
-async def health_check() -> HealthResponse:
+# Everything except the timestamps is fixed for the life of the process,
+# so the payload is built once instead of through Pydantic on every poll
+_STATIC_HEALTH_DATA = {
+    "status": "healthy",
+    "app_name": settings.app_name,
+    "version": settings.app_version,
+    "debug": settings.debug,
+}
+_HEALTH_MESSAGE = "API is running successfully"
+
+
+def build_health_response(timestamp: datetime) -> APIJSONResponse:
+    """
+    Build the health check response around the precomputed payload.
+
+    Args:
+        timestamp: Time to report in the response
+
+    Returns:
+        APIJSONResponse: Health payload in the HealthResponse format
+    """
+    return APIJSONResponse(
+        content={
+            "success": True,
+            "data": {**_STATIC_HEALTH_DATA, "timestamp": timestamp},
+            "message": _HEALTH_MESSAGE,
+            "timestamp": timestamp
+        },
+        headers={"Cache-Control": HEALTH_CACHE_CONTROL}
+    )
+
+
+# The handler returns a ready-made response, so there is no response_model to
+# validate against; `responses` keeps the schema in the OpenAPI docs.
+@router.get(
+    "/health",
+    response_model=None,
+    responses={200: {"model": HealthResponse}},
+    summary="Health Check"
+)
+async def health_check() -> APIJSONResponse:
     """
     Health check endpoint returning API status and version.
 
     Returns:
         HealthResponse: API health status with version and debug info
     """
-    try:
-        logger.info("Health check requested")
-
-        health_data = HealthData(
-            status="healthy",
-            app_name=settings.app_name,
-            version=settings.app_version,
-            debug=settings.debug,
-            timestamp=datetime.now()
-        )
-
-        return HealthResponse(
-            success=True,
-            data=health_data,
-            message="API is running successfully"
-        )
-
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Health check failed"
-        )
\ No newline at end of file
+    logger.debug("Health check requested")
+    return build_health_response(datetime.now(timezone.utc))
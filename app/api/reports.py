@@ -2,24 +2,137 @@
 Report generation routes for the Excel API.
 """
 
-from datetime import datetime
-from typing import Dict, Any
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Iterator
 from fastapi import APIRouter, HTTPException, Response, status
 from fastapi.responses import StreamingResponse
-import io
 
+from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.services.excel_service import excel_service
-from app.models.reports import ReportRequest
+from app.services.report_cache import report_cache
+from app.models.base import SuccessResponse
+from app.models.reports import ReportRequest, ReportResponse, Template1Payload
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+# Workbook rendering is synchronous openpyxl work, so it runs on this pool
+# instead of blocking the event loop for every other request
+_EXECUTOR = ThreadPoolExecutor(max_workers=settings.report_workers, thread_name_prefix="report")
+
+_XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Anything outside this set is replaced so the filename is safe to quote in a header
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+# Workbooks up to this size are sent in one piece; larger ones are chunked
+_STREAM_THRESHOLD = 10 * 1024 * 1024
+_STREAM_CHUNK_SIZE = 64 * 1024
 
 # Create reports router
 router = APIRouter(prefix="/api", tags=["reports"])
 
 
+def _iter_chunks(file_data: bytes) -> Iterator[memoryview]:
+    """Yield zero-copy slices of an already materialized file."""
+    view = memoryview(file_data)
+    for offset in range(0, len(view), _STREAM_CHUNK_SIZE):
+        yield view[offset:offset + _STREAM_CHUNK_SIZE]
+
+
+def _generate_report_cached(request: ReportRequest) -> ReportResponse:
+    """Generate a report, reusing cached output for repeated requests (runs on the worker pool)."""
+    # Building the key serializes and hashes the whole payload, so it is done
+    # here rather than on the event loop
+    cache_key = report_cache.make_key(request.template_name, request.data)
+    cached = report_cache.get(cache_key)
+    if cached is not None:
+        logger.debug("Report cache hit for %s", request.template_name)
+        return cached
+
+    report_response = excel_service.generate_report(request)
+
+    if report_response.success and report_response.file_data:
+        report_cache.set(cache_key, report_response)
+
+    return report_response
+
+
+async def _generate_report(request: ReportRequest) -> ReportResponse:
+    """Generate a report on the worker pool instead of the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_EXECUTOR, _generate_report_cached, request)
+
+
+def _build_report_response(report_response: ReportResponse, filename: str,
+                           failure_status: int = status.HTTP_400_BAD_REQUEST) -> Response:
+    """
+    Validate a generated report and wrap it as an Excel file download.
+
+    Args:
+        report_response: Result from the Excel service
+        filename: Download filename for the Content-Disposition header
+        failure_status: HTTP status to use when generation reported failure
+
+    Returns:
+        Response: Excel file download (streamed in chunks for very large files)
+    """
+    if not report_response.success:
+        logger.error("Report generation failed: %s", report_response.message)
+        raise HTTPException(
+            status_code=failure_status,
+            detail=report_response.message
+        )
+
+    if not report_response.file_data:
+        logger.error("Report generated but no file data returned")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Report generation completed but no file data available"
+        )
+
+    logger.info("Report generated successfully: %s (%s bytes)", filename, report_response.data.get("size"))
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{_UNSAFE_FILENAME_CHARS.sub("_", filename)}"',
+        "Content-Length": str(len(report_response.file_data)),
+        # XLSX is already ZIP-compressed; keeps GZipMiddleware from recompressing it
+        "Content-Encoding": "identity"
+    }
+
+    if len(report_response.file_data) > _STREAM_THRESHOLD:
+        return StreamingResponse(
+            _iter_chunks(report_response.file_data),
+            media_type=_XLSX_MEDIA_TYPE,
+            headers=headers
+        )
+
+    return Response(
+        content=report_response.file_data,
+        media_type=_XLSX_MEDIA_TYPE,
+        headers=headers
+    )
+
+
+@router.get("/reports/cache/stats", response_model=SuccessResponse, summary="Report Cache Statistics")
+async def report_cache_stats() -> SuccessResponse:
+    """
+    Report cache hit/miss counters for monitoring.
+
+    Returns:
+        SuccessResponse: Cache counters, current size and limits
+    """
+    return SuccessResponse(
+        data=report_cache.stats(),
+        message="Report cache statistics retrieved successfully"
+    )
+
+
 @router.post("/reports/1", summary="Generate Template-1 Report")
-async def generate_template_1_report(data: Dict[str, Any]) -> Response:
+async def generate_template_1_report(payload: Template1Payload) -> Response:
     """
     Generate a report using Template-1.xlsx (Financial Cost Center Report).
 
@@ -39,59 +152,36 @@ async def generate_template_1_report(data: Dict[str, Any]) -> Response:
         ]
     }
 
+    Rows are validated against Template1Row before any work is done, so
+    malformed values are rejected with a 422.
+
     Args:
-        data: Report data with rows array containing financial data
+        payload: Report data with rows array containing financial data
 
     Returns:
-        StreamingResponse: Excel file download
+        Response: Excel file download
     """
     try:
         logger.info("Template-1 report generation requested")
-        logger.debug(f"Data rows: {len(data.get('rows', []))}")
+        logger.debug("Template-1 rows: %d", len(payload.rows))
 
-        # Create ReportRequest for Template-1
+        # Create ReportRequest for Template-1 (rows keyed by template column headers)
         request = ReportRequest(
             template_name="Template-1.xlsx",
-            data=data
+            data=payload.model_dump(by_alias=True, exclude_none=True)
         )
 
-        # Generate the report using excel service
-        report_response = excel_service.generate_report(request)
+        # Generate the report using excel service (off the event loop)
+        report_response = await _generate_report(request)
 
-        if not report_response.success:
-            logger.error(f"Template-1 report generation failed: {report_response.message}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=report_response.message
-            )
-
-        if not report_response.file_data:
-            logger.error("Template-1 report generated but no file data returned")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Report generation completed but no file data available"
-            )
-
-        # Create filename for download
         filename = report_response.data.get("filename", "template_1_report.xlsx")
-
-        logger.info(f"Template-1 report generated successfully: {filename} ({report_response.data.get('size')} bytes)")
-
-        # Return Excel file as download
-        return StreamingResponse(
-            io.BytesIO(report_response.file_data),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Length": str(len(report_response.file_data))
-            }
-        )
+        return _build_report_response(report_response, filename)
 
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
     except Exception as e:
-        logger.error(f"Unexpected error generating Template-1 report: {e}")
+        logger.error("Unexpected error generating Template-1 report: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred while generating the Template-1 report"
@@ -110,70 +200,15 @@ async def generate_template_1_report_from_db() -> Response:
     4. Generates and returns the Excel file
 
     This is the typical production pattern where the API fetches data rather than
-    receiving it in a POST body.
+    receiving it in a POST body. See docs/DATABASE_INTEGRATION.md for the query
+    parameter, SQL and service examples.
 
     TODO: Replace the mock implementation with actual database integration
     """
     try:
         logger.info("Template-1 database report generation requested (PRODUCTION PATTERN)")
 
-        # STEP 1: Parse query parameters (add as function parameters as needed)
-        # In production, you'd add query parameters like:
-        #
-        # async def generate_template_1_report_from_db(
-        #     date_range: str = Query(None, description="Date range filter YYYY-MM-DD to YYYY-MM-DD"),
-        #     cost_center: str = Query(None, description="Filter by cost center"),
-        #     rule_ids: List[str] = Query(None, description="Filter by specific rule IDs"),
-        #     format_numbers: bool = Query(True, description="Apply number formatting"),
-        #     db: DatabaseService = Depends(get_database)
-        # ):
-
-        # STEP 2: Database Query Setup & Execution
-        # Example of what your database query might look like:
-        #
-        # query = """
-        #     SELECT
-        #         rule_id as "Rule ID",
-        #         cost_center_group as "Cost Center Group",
-        #         pool_amount as "Pool Amount",
-        #         abcr_amount as "AB/CR Amount",
-        #         base_amount as "Base Amount",
-        #         actual_rate as "Actual Rate",
-        #         fp_rate as "FP Rate",
-        #         (actual_rate - fp_rate) as "AB/CR Rate Diff"
-        #     FROM financial_reports
-        #     WHERE 1=1
-        #       AND (:date_range IS NULL OR report_date BETWEEN :start_date AND :end_date)
-        #       AND (:cost_center IS NULL OR cost_center_group = :cost_center)
-        #       AND (:rule_ids IS NULL OR rule_id = ANY(:rule_ids))
-        #     ORDER BY rule_id
-        # """
-        #
-        # db_results = await db.fetch_all(query, {
-        #     "date_range": date_range,
-        #     "start_date": parse_date_range(date_range)[0] if date_range else None,
-        #     "end_date": parse_date_range(date_range)[1] if date_range else None,
-        #     "cost_center": cost_center,
-        #     "rule_ids": rule_ids
-        # })
-
-        # STEP 3: Transform Database Results to Template Format
-        # Convert your database results to the exact format Template-1 expects:
-        #
-        # report_rows = []
-        # for row in db_results:
-        #     report_rows.append({
-        #         "Rule ID": row["Rule ID"],
-        #         "Cost Center Group": row["Cost Center Group"],
-        #         "Pool Amount": float(row["Pool Amount"]) if row["Pool Amount"] else 0.0,
-        #         "AB/CR Amount": float(row["AB/CR Amount"]) if row["AB/CR Amount"] else 0.0,
-        #         "Base Amount": float(row["Base Amount"]) if row["Base Amount"] else 0.0,
-        #         "Actual Rate": float(row["Actual Rate"]) if row["Actual Rate"] else 0.0,
-        #         "FP Rate": float(row["FP Rate"]) if row["FP Rate"] else 0.0,
-        #         "AB/CR Rate Diff": float(row["AB/CR Rate Diff"]) if row["AB/CR Rate Diff"] else 0.0
-        #     })
-
-        # MOCK DATA for demonstration (replace with actual database query above)
+        # MOCK DATA for demonstration (replace with a real database query)
         logger.info("Fetching Template-1 data from database (MOCK - replace with real DB query)")
 
         mock_db_results = [
@@ -209,104 +244,28 @@ async def generate_template_1_report_from_db() -> Response:
             }
         ]
 
-        # STEP 4: Create ReportRequest with database data
         request = ReportRequest(
             template_name="Template-1.xlsx",
             data={"rows": mock_db_results}
         )
 
-        # STEP 5: Generate Excel report using existing service
-        report_response = excel_service.generate_report(request)
-
-        if not report_response.success:
-            logger.error(f"Template-1 database report generation failed: {report_response.message}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=report_response.message
-            )
-
-        if not report_response.file_data:
-            logger.error("Template-1 database report generated but no file data returned")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Report generation completed but no file data available"
-            )
-
-        # STEP 6: Return file download with descriptive filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"template_1_db_report_{timestamp}.xlsx"
+        # Generate Excel report using existing service (off the event loop)
+        report_response = await _generate_report(request)
 
-        logger.info(f"Template-1 database report generated: {filename} ({report_response.data.get('size')} bytes)")
+        # Return file download with descriptive filename
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        filename = f"template_1_db_report_{timestamp}.xlsx"
 
-        return StreamingResponse(
-            io.BytesIO(report_response.file_data),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Length": str(len(report_response.file_data))
-            }
+        return _build_report_response(
+            report_response, filename, failure_status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
     except Exception as e:
-        logger.error(f"Unexpected error generating Template-1 database report: {e}")
+        logger.error("Unexpected error generating Template-1 database report: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred while generating the database report"
         )
-
-
-# PRODUCTION DATABASE INTEGRATION EXAMPLES:
-# ==========================================
-#
-# 1. Add these imports to the top of this file:
-#    from fastapi import Query, Depends
-#    from typing import List, Optional
-#    from app.database import get_database
-#    from app.services.database_service import DatabaseService
-#
-# 2. Create a database service (app/services/database_service.py):
-#    ```python
-#    class DatabaseService:
-#        def __init__(self, connection):
-#            self.connection = connection
-#
-#        async def fetch_template_1_data(self, filters: dict) -> List[dict]:
-#            # Execute your SQL query here
-#            # Return list of dictionaries matching Template-1 column structure
-#            pass
-#    ```
-#
-# 3. Add query parameter models (app/models/queries.py):
-#    ```python
-#    class Template1QueryParams(BaseModel):
-#        date_range: Optional[str] = Field(None, description="YYYY-MM-DD to YYYY-MM-DD")
-#        cost_center: Optional[str] = Field(None, description="Filter by cost center")
-#        rule_ids: Optional[List[str]] = Field(None, description="Filter by rule IDs")
-#        include_totals: bool = Field(True, description="Include totals row")
-#    ```
-#
-# 4. Example with dependency injection:
-#    ```python
-#    async def generate_template_1_report_from_db(
-#        date_range: str = Query(None, description="Date range YYYY-MM-DD to YYYY-MM-DD"),
-#        cost_center: str = Query(None, description="Filter by cost center"),
-#        rule_ids: List[str] = Query(None, description="Filter by rule IDs"),
-#        format_numbers: bool = Query(True, description="Apply formatting"),
-#        db: DatabaseService = Depends(get_database)
-#    ):
-#        # Build filters dict
-#        filters = {
-#            "date_range": date_range,
-#            "cost_center": cost_center,
-#            "rule_ids": rule_ids
-#        }
-#
-#        # Fetch data from database
-#        db_data = await db.fetch_template_1_data(filters)
-#
-#        # Generate report with fetched data
-#        # ... rest of report generation logic
-#    ```
\ No newline at end of file
@@ -2,7 +2,9 @@
 Template management routes for the Excel API.
 """
 
-from fastapi import APIRouter, HTTPException, status
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
 
 from app.core.logging import get_logger
 from app.services.template_service import template_service
@@ -13,14 +15,44 @@ logger = get_logger(__name__)
 # Create templates router
 router = APIRouter(prefix="/api", tags=["templates"])
 
+# Clients may reuse a template listing for this long before revalidating
+TEMPLATES_CACHE_CONTROL = "public, max-age=60"
+
+# A failed listing must not be reused by clients or proxies
+NO_STORE_CACHE_CONTROL = "no-store"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
 
-@router.get("/templates", response_model=TemplateListResponse, summary="List Templates")
-async def list_templates() -> TemplateListResponse:
+
+# The service already returns a validated TemplateListResponse, so it is
+# serialized directly by pydantic-core instead of being dumped and re-validated
+# against a response_model; `responses` keeps the schema in the OpenAPI docs.
+@router.get(
+    "/templates",
+    response_model=None,
+    responses={200: {"model": TemplateListResponse}},
+    summary="List Templates"
+)
+async def list_templates(request: Request) -> Response:
     """
     List all available Excel templates.
 
     This endpoint scans the templates directory and returns information
     about available templates including their structure and sample data.
+    Successful responses carry an ETag derived from the template files, and a
+    matching If-None-Match gets a 304 without rescanning the directory. A failed
+    listing is sent with Cache-Control: no-store and no ETag.
 
     Returns:
         TemplateListResponse: List of available templates with metadata
@@ -28,18 +60,29 @@ async def list_templates() -> TemplateListResponse:
     try:
         logger.info("Templates listing requested")
 
-        # Get templates from service
-        templates_response = template_service.list_templates()
+        # Both stat the template files (blocking IO), so they run off the event loop
+        etag = await asyncio.to_thread(template_service.get_templates_etag)
+        cache_headers = {"ETag": etag, "Cache-Control": TEMPLATES_CACHE_CONTROL}
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+        templates_response = await asyncio.to_thread(template_service.list_templates)
 
         if templates_response.success:
-            logger.info(f"Found {len(templates_response.data['templates'])} templates")
+            logger.info("Found %d templates", len(templates_response.data["templates"]))
         else:
-            logger.warning(f"Template listing failed: {templates_response.message}")
+            logger.warning("Template listing failed: %s", templates_response.message)
+            cache_headers = {"Cache-Control": NO_STORE_CACHE_CONTROL}
 
-        return templates_response
+        return Response(
+            content=templates_response.model_dump_json(),
+            media_type="application/json",
+            headers=cache_headers
+        )
 
     except Exception as e:
-        logger.error(f"Error listing templates: {e}")
+        logger.error("Error listing templates: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to list templates"
@@ -6,6 +6,8 @@ This is similar to environment configuration in Node.js, but with automatic
 type validation and environment variable loading.
 """
 
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -29,6 +31,7 @@ class Settings(BaseSettings):
     # Directory paths
     templates_dir: str = "./templates"
     logs_dir: str = "./logs"
+    template_scan_workers: int = 8  # Threads used to scan templates when listing them
 
     # Logging configuration
     log_level: str = "DEBUG"
@@ -36,6 +39,13 @@ class Settings(BaseSettings):
     log_max_bytes: int = 10_000_000  # 10MB
     log_backup_count: int = 5
 
+    # Report generation settings
+    report_workers: int = 4  # Threads available for concurrent workbook rendering
+    report_cache_size: int = 128  # Cached reports kept in memory (0 disables caching)
+    report_cache_ttl: int = 300  # Seconds a cached report stays valid
+    report_cache_max_bytes: int = 256_000_000  # Total workbook bytes kept in the cache (256MB)
+    report_cache_max_entry_bytes: int = 16_000_000  # Larger reports are never cached (16MB)
+
     # CORS settings (for future use)
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:8080"]
     cors_allow_credentials: bool = True
@@ -49,14 +59,14 @@ class Settings(BaseSettings):
     )
 
 
-# Create a global instance (similar to exporting config object in Node.js)
-settings = Settings()
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Dependency function for FastAPI to inject settings.
 
     This pattern allows for easy testing and dependency injection,
     similar to how you might inject config in Express middleware.
+    Settings are built (and the environment/.env read) once; every later
+    call, including Depends(get_settings), returns the same cached instance.
+    Tests that change the environment can call get_settings.cache_clear().
     """
-    return settings
+    return Settings()
@@ -0,0 +1,51 @@
+"""
+ASGI middleware for the Excel API application.
+
+These are plain ASGI callables rather than Starlette's BaseHTTPMiddleware
+(what @app.middleware("http") builds): they wrap send() instead of building a
+Request/Response pair for every call, and leave streaming responses untouched.
+"""
+
+from time import monotonic, time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import log_request
+
+
+class TimingMiddleware:
+    """Log every HTTP request with its status code and duration.
+
+    Similar to morgan in Express. Also records the wall-clock start time in the
+    request state (request.state.started_at) so handlers can timestamp their
+    responses without calling datetime.now() again.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Monotonic clock: cheap and immune to wall-clock jumps
+        start = monotonic()
+        scope.setdefault("state", {})["started_at"] = time()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            log_request(
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                duration_ms=(monotonic() - start) * 1000.0
+            )
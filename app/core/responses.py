@@ -0,0 +1,23 @@
+"""
+JSON response class shared by every route of the Excel API.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class APIJSONResponse(ORJSONResponse):
+    """ORJSONResponse that writes UTC datetimes with a "Z" suffix.
+
+    Pydantic models (the templates listing, routes with a response_model) already
+    serialize UTC timestamps as "...Z", while orjson defaults to "...+00:00".
+    Rendering plain dicts with OPT_UTC_Z gives every endpoint the same format.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+        )
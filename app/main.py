@@ -7,19 +7,22 @@ validation, and dependency injection.
 """
 
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 import uvicorn
 
-from app.core.config import settings
-from app.core.logging import get_logger, log_request
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.middleware import TimingMiddleware
+from app.core.responses import APIJSONResponse
 
 # Initialize logger for this module
 logger = get_logger(__name__)
+settings = get_settings()
 
 
 @asynccontextmanager
@@ -30,9 +33,9 @@ async def lifespan(app: FastAPI):
     FastAPI uses this pattern instead of separate startup/shutdown decorators.
     """
     # Startup
-    logger.info(f"Starting {settings.app_name} v{settings.app_version}")
-    logger.info(f"Debug mode: {settings.debug}")
-    logger.info(f"API prefix: {settings.api_prefix}")
+    logger.info("Starting %s v%s", settings.app_name, settings.app_version)
+    logger.info("Debug mode: %s", settings.debug)
+    logger.info("API prefix: %s", settings.api_prefix)
 
     yield  # Application runs here
 
@@ -47,6 +50,9 @@ app = FastAPI(
     description="Python API for Excel report generation from templates",
     debug=settings.debug,
     lifespan=lifespan,
+    # orjson is considerably faster than stdlib json and serializes datetimes natively
+    # (with the same "Z" UTC suffix as the Pydantic-serialized responses)
+    default_response_class=APIJSONResponse,
     # API documentation will be available at /docs
     docs_url="/docs",
     redoc_url="/redoc",
@@ -62,10 +68,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression for JSON payloads. Responses that already declare a
+# Content-Encoding (the XLSX downloads, which are ZIP containers) pass through untouched.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Request logging middleware (like morgan in Express). Added last so it is the
+# outermost of our middleware and times the full request, compression included.
+app.add_middleware(TimingMiddleware)
+
+
+def request_timestamp(request: Request) -> datetime:
+    """Wall-clock time the request started, as recorded by TimingMiddleware.
+
+    Reuses the value captured once per request instead of building a new
+    timestamp for every response body; falls back to now if it is missing.
+    """
+    started_at = getattr(request.state, "started_at", None)
+    if started_at is None:
+        return datetime.now(timezone.utc)
+    return datetime.fromtimestamp(started_at, timezone.utc)
+
 
 # Custom Exception Handlers (PRD-compliant error format)
 @app.exception_handler(HTTPException)
-async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
+async def http_exception_handler(request: Request, exc: HTTPException) -> APIJSONResponse:
     """Handle HTTP exceptions with standardized error format.
 
     Returns errors in the format specified in the PRD:
@@ -79,7 +105,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
         "timestamp": "2025-11-04T10:30:00Z"
     }
     """
-    return JSONResponse(
+    return APIJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -88,21 +114,21 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
                 "message": exc.detail,
                 "details": None
             },
-            "timestamp": datetime.now().isoformat()
+            "timestamp": request_timestamp(request)
         }
     )
 
 
 @app.exception_handler(Exception)
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> APIJSONResponse:
     """Handle unexpected exceptions with standardized error format.
 
     Logs the full error details but returns safe error message to client.
     """
     # Log the full error for debugging
-    logger.error(f"Unexpected error in {request.method} {request.url.path}: {str(exc)}", exc_info=True)
+    logger.error("Unexpected error in %s %s: %s", request.method, request.url.path, exc, exc_info=True)
 
-    return JSONResponse(
+    return APIJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -111,60 +137,16 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
                 "message": "An unexpected error occurred",
                 "details": str(exc) if settings.debug else None
             },
-            "timestamp": datetime.now().isoformat()
+            "timestamp": request_timestamp(request)
         }
     )
 
 
-# Request logging middleware (like morgan in Express)
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all HTTP requests with timing information."""
-    start_time = datetime.now()
-
-    # Process the request
-    response = await call_next(request)
-
-    # Calculate duration
-    duration = (datetime.now() - start_time).total_seconds() * 1000
-
-    # Log the request
-    log_request(
-        method=request.method,
-        path=str(request.url.path),
-        status_code=response.status_code,
-        duration_ms=duration
-    )
-
-    return response
-
-
-# Basic health check endpoint (we'll add more routes later)
-@app.get("/api/health")
-async def main_health_check() -> dict[str, Any]:
-    """Health check endpoint.
-
-    Returns basic application status and information.
-    This follows the PRD success response format.
-    """
-    return {
-        "success": True,
-        "data": {
-            "status": "healthy",
-            "app_name": settings.app_name,
-            "version": settings.app_version,
-            "debug": settings.debug,
-            "timestamp": datetime.now().isoformat()
-        },
-        "message": "API is running successfully",
-        "timestamp": datetime.now().isoformat()
-    }
-
-
 # Root endpoint
 @app.get("/")
-async def root() -> dict[str, Any]:
+async def root(request: Request) -> dict[str, Any]:
     """Root endpoint with API information."""
+    timestamp = request_timestamp(request)
     return {
         "success": True,
         "data": {
@@ -174,7 +156,7 @@ async def root() -> dict[str, Any]:
             "health": "/api/health"
         },
         "message": "API root endpoint",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": timestamp
     }
 
 
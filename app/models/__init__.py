@@ -31,6 +31,8 @@ from .templates import (
 from .reports import (
     ReportRequest,
     ReportResponse,
+    Template1Row,
+    Template1Payload,
 )
 
 # Export all models for easy importing
@@ -54,4 +56,6 @@ __all__ = [
     # Report models
     "ReportRequest",
     "ReportResponse",
+    "Template1Row",
+    "Template1Payload",
 ]
\ No newline at end of file
@@ -5,9 +5,10 @@ These models define the standard response format used across all endpoints
 as specified in the PRD.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
 from typing import Any, Dict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class BaseResponse(BaseModel):
@@ -16,9 +17,12 @@ class BaseResponse(BaseModel):
     This ensures consistent response format across all endpoints
     as specified in the PRD.
     """
+    # Schemas are built on first use instead of at import. Responses are immutable
+    # once created, since cached reports are handed to many requests.
+    model_config = ConfigDict(defer_build=True, frozen=True, extra='ignore')
     success: bool
     message: str
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: datetime = Field(default_factory=partial(datetime.now, timezone.utc))
 
 
 class SuccessResponse(BaseResponse):
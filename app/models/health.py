@@ -3,13 +3,14 @@ Health check related models.
 """
 
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from .base import BaseResponse
 
 
 class HealthData(BaseModel):
     """Health check response data structure."""
+    model_config = ConfigDict(defer_build=True, frozen=True, extra='ignore')
     status: str = "healthy"
     app_name: str
     version: str
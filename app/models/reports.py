@@ -2,11 +2,16 @@
 Report generation related models.
 """
 
-from typing import Any, Dict, Optional
-from pydantic import BaseModel, Field, field_validator
+import re
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .base import BaseResponse
 
+# Characters that are not allowed in a template filename
+_INVALID_TEMPLATE_NAME_CHARS = ['/', '\\', ':', '*', '?', '"', '<', '>', '|']
+_INVALID_TEMPLATE_NAME_RE = re.compile(f"[{re.escape(''.join(_INVALID_TEMPLATE_NAME_CHARS))}]")
+
 
 class ReportRequest(BaseModel):
     """Request model for generating Excel reports.
@@ -17,6 +22,8 @@ class ReportRequest(BaseModel):
         data: Record<string, any>;
     }
     """
+    # Validated once at the API boundary and only read afterwards
+    model_config = ConfigDict(defer_build=True, frozen=True, extra='ignore')
     template_name: str = Field(
         description="Name of the template to use (with or without .xlsx extension)",
         examples=["annual-report", "Template-1.xlsx"]
@@ -46,10 +53,9 @@ class ReportRequest(BaseModel):
         if not v.endswith('.xlsx'):
             v += '.xlsx'
 
-        # Basic filename validation
-        invalid_chars = ['/', '\\', ':', '*', '?', '"', '<', '>', '|']
-        if any(char in v for char in invalid_chars):
-            raise ValueError(f'Template name contains invalid characters: {invalid_chars}')
+        # Basic filename validation (one regex scan instead of a pass per character)
+        if _INVALID_TEMPLATE_NAME_RE.search(v):
+            raise ValueError(f'Template name contains invalid characters: {_INVALID_TEMPLATE_NAME_CHARS}')
 
         return v
 
@@ -79,7 +85,49 @@ class ReportResponse(BaseResponse):
         }]
     )
     message: str = "Report generated successfully"
+    # The workbook travels with the metadata to the route, which sends it as the
+    # file download. It is never part of a JSON body or repr: dumping it would
+    # base64/escape-encode a multi-MB payload for nothing.
     file_data: Optional[bytes] = Field(
         None,
-        description="Binary Excel file data for download"
-    )
\ No newline at end of file
+        description="Binary Excel file data for download",
+        exclude=True,
+        repr=False
+    )
+
+
+class Template1Row(BaseModel):
+    """One data row of Template-1.xlsx (Financial Cost Center Report).
+
+    Field aliases are the template's column headers, so rows are accepted
+    (and dumped with by_alias=True) exactly as the template names them.
+    Validation runs in pydantic-core, so the generator receives rows that are
+    already typed. Columns left out of a row stay empty in the report.
+    """
+    model_config = ConfigDict(populate_by_name=True, coerce_numbers_to_str=True)
+
+    rule_id: Optional[str] = Field(None, alias="Rule ID")
+    cost_center_group: Optional[str] = Field(None, alias="Cost Center Group")
+    pool_amount: Optional[float] = Field(None, alias="Pool Amount")
+    abcr_amount: Optional[float] = Field(None, alias="AB/CR Amount")
+    base_amount: Optional[float] = Field(None, alias="Base Amount")
+    actual_rate: Optional[float] = Field(None, alias="Actual Rate")
+    fp_rate: Optional[float] = Field(None, alias="FP Rate")
+    abcr_rate_diff: Optional[float] = Field(None, alias="AB/CR Rate Diff")
+
+
+class Template1Payload(BaseModel):
+    """Request body for the Template-1 report endpoint."""
+    rows: List[Template1Row] = Field(
+        description="Report rows keyed by Template-1 column headers",
+        examples=[[{
+            "Rule ID": "RULE001",
+            "Cost Center Group": "IT Department",
+            "Pool Amount": 50000.00,
+            "AB/CR Amount": 12500.00,
+            "Base Amount": 45000.00,
+            "Actual Rate": 0.25,
+            "FP Rate": 0.22,
+            "AB/CR Rate Diff": 0.03
+        }]]
+    )
@@ -4,7 +4,7 @@ Template management related models.
 
 from datetime import datetime
 from typing import List, Dict, Any
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .base import BaseResponse
 
@@ -23,6 +23,8 @@ class TemplateInfo(BaseModel):
         sampleData: Record<string, any>;
     }
     """
+    # Cached per template file and shared between listings, so never mutated
+    model_config = ConfigDict(defer_build=True, frozen=True, extra='ignore')
     name: str = Field(..., description="Template display name (without .xlsx extension)")
     filename: str = Field(..., description="Full filename including .xlsx extension")
     size: int = Field(..., description="File size in bytes")
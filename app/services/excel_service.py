@@ -5,22 +5,143 @@ Each template should have its own generator function for maximum flexibility.
 """
 
 import io
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
-from datetime import datetime
+from datetime import datetime, timezone
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 from openpyxl.worksheet.table import Table
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.services.template_service import template_service
 from app.models.reports import ReportRequest, ReportResponse
+from app.models.templates import TemplateInfo
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Shared style objects. openpyxl styles are immutable and deduplicated on save,
+# so one instance can be assigned to any number of cells instead of building
+# new ones per call or per cell.
+_BOLD_FONT = Font(bold=True)
+_THIN_SIDE = Side(style='thin')
+_THIN_BORDER = Border(left=_THIN_SIDE, right=_THIN_SIDE, top=_THIN_SIDE, bottom=_THIN_SIDE)
+_HEADER_ALIGN = Alignment(horizontal="center", vertical="center")
+_DATA_ALIGN = Alignment(horizontal="left", vertical="center")
+
+
+# Marks a column that is absent from a data row (None is a valid cell value)
+_MISSING = object()
+
+# openpyxl releases whose private worksheet attributes the fast paths below were
+# verified against; on any other release those paths are skipped.
+# test_openpyxl_private_attributes fails when the installed openpyxl is not listed.
+_VERIFIED_OPENPYXL_RELEASES = ("3.1.",)
+_OPENPYXL_INTERNALS_VERIFIED = openpyxl.__version__.startswith(_VERIFIED_OPENPYXL_RELEASES)
+
+# Letters for the first 1024 columns, far more than any report uses
+_COL_LETTERS = tuple(get_column_letter(col_idx) for col_idx in range(1, 1025))
+
+
+def _column_letter(col_idx: int) -> str:
+    """Column letter for a 1-based column index."""
+    if col_idx <= len(_COL_LETTERS):
+        return _COL_LETTERS[col_idx - 1]
+    return get_column_letter(col_idx)
+
+
+def _error_response(message: str) -> ReportResponse:
+    """
+    Build a failed ReportResponse without running validation.
+
+    Every field is known to be valid here, so model_construct skips the
+    pydantic-core validation pass (defaults such as timestamp are still filled in).
+    """
+    return ReportResponse.model_construct(success=False, data={}, message=message, file_data=None)
+
+
+@lru_cache(maxsize=32)
+def _fill(color: str) -> PatternFill:
+    """Solid fill for a color, built once per color."""
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+@lru_cache(maxsize=32)
+def _bold_font(color: str) -> Font:
+    """Bold font in a color, built once per color."""
+    return Font(color=color, bold=True)
+
+
+# Font, fill and alignment of each write_table style role; the border depends
+# on whether the table is formatted
+_TABLE_STYLE_ROLES = {
+    "Header": dict(font=_bold_font("FFFFFF"), fill=_fill("366092"), alignment=_HEADER_ALIGN),
+    "Data": dict(alignment=_DATA_ALIGN),
+    "Totals": dict(font=_BOLD_FONT, fill=_fill("E7E6E6")),
+}
+
+
+def _table_style(workbook: openpyxl.Workbook, role: str, bordered: bool) -> str:
+    """
+    Name of a write_table style role, registered on the workbook on first use.
+
+    Named styles are bound to the workbook they are added to, so they are created
+    per workbook (and never shared between concurrently generated reports). Only
+    the roles a table actually uses are registered, so a workbook carries no
+    unused styles.
+
+    Named styles are saved with the workbook, so a delivered report lists the
+    ones it uses ("Report Header", "Report Data", "Report Totals", or their
+    " (No Border)" variants) in Excel's Cell Styles gallery. This is intended:
+    they name the report's own formatting and can be reapplied to new cells.
+    """
+    suffix = "" if bordered else " (No Border)"
+    name = f"Report {role}{suffix}"
+    if name not in workbook.named_styles:
+        border = _THIN_BORDER if bordered else Border()
+        workbook.add_named_style(NamedStyle(name=name, border=border, **_TABLE_STYLE_ROLES[role]))
+    return name
+
+
+def _style_array(worksheet, style_name: str):
+    """The workbook's style array for a registered named style, or None if it can't be read.
+
+    openpyxl has no public way to get the style array a named style resolves
+    to; it is only held in the private `cell._style`. Keep that access in this
+    one place, and only on a release listed in _VERIFIED_OPENPYXL_RELEASES.
+    """
+    if not _OPENPYXL_INTERNALS_VERIFIED:
+        return None
+    cell = WriteOnlyCell(worksheet)
+    cell.style = style_name
+    return getattr(cell, "_style", None)
+
+
+def _next_append_row(worksheet) -> Optional[int]:
+    """The row `worksheet.append` writes to next, or None if it can't be read.
+
+    openpyxl only tracks this privately: `max_row` reports 1 for an empty sheet
+    as well as for one holding just A1, and probing A1 with `cell()` would create
+    it and move the append position. Keep the private access in this one place,
+    and only on a verified openpyxl release.
+    """
+    if not _OPENPYXL_INTERNALS_VERIFIED:
+        return None
+    current_row = getattr(worksheet, "_current_row", None)
+    if not isinstance(current_row, int):
+        return None
+    return current_row + 1
+
+
+def _summed_columns(columns: List[str]) -> List[str]:
+    """Columns that get a value in a totals row: all but the label column and ID columns."""
+    return [name for name in columns[1:] if not name.lower().endswith('id')]
+
 
 class ExcelUtilities:
     """Utility functions for Excel operations - NOT template-specific."""
@@ -28,53 +149,127 @@ class ExcelUtilities:
     def __init__(self):
         logger.info("Excel utilities initialized")
 
-    def create_workbook(self, sheet_name: str = "Report") -> openpyxl.Workbook:
-        """Create a new Excel workbook with specified sheet name."""
+    def create_workbook(self, sheet_name: str = "Report", streaming: bool = False) -> openpyxl.Workbook:
+        """
+        Create a new Excel workbook with specified sheet name.
+
+        With streaming=True the workbook is write-only: rows are serialized as they
+        are appended instead of being kept as Cell objects, which is much faster and
+        lighter for large reports. Write-only sheets can only be filled top to bottom,
+        so formatting has to be applied as rows are added and column widths set first.
+        """
+        if streaming:
+            workbook = openpyxl.Workbook(write_only=True)
+            workbook.create_sheet(sheet_name)
+            return workbook
+
         workbook = openpyxl.Workbook()
         worksheet = workbook.active
         worksheet.title = sheet_name
         return workbook
 
-    def add_headers(self, worksheet, headers: List[str], row: int = 1, start_col: int = 1) -> None:
-        """Add header row to worksheet."""
+    def add_headers(self, worksheet, headers: List[str], row: int = 1, start_col: int = 1,
+                    formatted: bool = False) -> None:
+        """
+        Add header row to worksheet.
+
+        On a write-only worksheet the row is appended (`row` is ignored), and
+        formatted=True styles the header cells as they are written.
+        """
+        if isinstance(worksheet, WriteOnlyWorksheet):
+            if formatted:
+                header_cells = []
+                for header_name in headers:
+                    cell = WriteOnlyCell(worksheet, value=header_name)
+                    cell.fill = _fill("366092")
+                    cell.font = _bold_font("FFFFFF")
+                    cell.alignment = _HEADER_ALIGN
+                    header_cells.append(cell)
+                worksheet.append([None] * (start_col - 1) + header_cells)
+            else:
+                worksheet.append([None] * (start_col - 1) + list(headers))
+            return
+
         for col_idx, header_name in enumerate(headers, start_col):
             cell = worksheet.cell(row=row, column=col_idx)
             cell.value = header_name
 
+        if formatted:
+            self.apply_header_formatting(worksheet, headers, header_row=row, start_col=start_col)
+
     def populate_data_rows(self, worksheet, data_rows: List[Dict[str, Any]],
                           columns: List[str], start_row: int = 2, start_col: int = 1) -> int:
         """
         Populate data rows in worksheet.
 
+        On a write-only worksheet each row is appended in a single call
+        (`start_row` is then only used to compute the return value). Rows that
+        start right below the sheet's last row are appended the same way when
+        the append position is known (see _next_append_row).
+
         Returns:
             int: The next available row after data
         """
+        if isinstance(worksheet, WriteOnlyWorksheet):
+            padding = [None] * (start_col - 1)
+            for row_data in data_rows:
+                worksheet.append(padding + [row_data.get(column_name) for column_name in columns])
+            return start_row + len(data_rows)
+
+        if start_row == _next_append_row(worksheet):
+            # The rows go straight below everything already on the sheet, so each
+            # one is appended whole with values in column order instead of being
+            # set cell by cell (append creates the cells directly)
+            padding = [None] * (start_col - 1)
+            for row_data in data_rows:
+                worksheet.append(padding + [row_data.get(column_name) for column_name in columns])
+            return start_row + len(data_rows)
+
         current_row = start_row
 
         for row_data in data_rows:
             for col_idx, column_name in enumerate(columns, start_col):
-                if column_name in row_data:
-                    cell = worksheet.cell(row=current_row, column=col_idx)
-                    cell.value = row_data[column_name]
+                # One lookup per column; columns missing from the row are left untouched
+                value = row_data.get(column_name, _MISSING)
+                if value is not _MISSING:
+                    worksheet.cell(row=current_row, column=col_idx, value=value)
             current_row += 1
 
         return current_row
 
     def add_calculated_totals_row(self, worksheet, columns: List[str], data_rows: List[Dict[str, Any]],
                                  totals_row: int, start_col: int = 1) -> None:
-        """Add manually calculated totals row (for templates without SUM formulas)."""
+        """
+        Add manually calculated totals row (for templates without SUM formulas).
+
+        Write-only worksheets cannot go back to a row, so there the totals row is
+        appended after the data instead (`totals_row` is ignored).
+        """
         if not data_rows:
             return
 
+        # Only columns that end up in the totals row are summed: the first one
+        # holds the label and ID columns are never totalled. Each column is then
+        # summed with one C-level sum() instead of checking every key of every row.
         totals = {}
-
-        # Calculate totals for numeric columns
-        for row_data in data_rows:
-            for column_name, value in row_data.items():
-                if isinstance(value, (int, float)) and not column_name.lower().endswith('id'):
-                    if column_name not in totals:
-                        totals[column_name] = 0.0
-                    totals[column_name] += value
+        for column_name in _summed_columns(columns):
+            values = [
+                value for row_data in data_rows
+                if isinstance(value := row_data.get(column_name), (int, float))
+            ]
+            if values:
+                totals[column_name] = sum(values, 0.0)
+
+        if isinstance(worksheet, WriteOnlyWorksheet):
+            totals_cells = [None] * (start_col - 1)
+            for col_idx, column_name in enumerate(columns):
+                value = "Total" if col_idx == 0 else totals.get(column_name)
+                cell = WriteOnlyCell(worksheet, value=value)
+                if value is not None:
+                    cell.font = _BOLD_FONT
+                totals_cells.append(cell)
+            worksheet.append(totals_cells)
+            return
 
         # Set totals in worksheet
         for col_idx, column_name in enumerate(columns, start_col):
@@ -82,10 +277,10 @@ class ExcelUtilities:
 
             if col_idx == start_col:  # First column gets "Total" label
                 cell.value = "Total"
-                cell.font = Font(bold=True)
+                cell.font = _BOLD_FONT
             elif column_name in totals:
                 cell.value = totals[column_name]
-                cell.font = Font(bold=True)
+                cell.font = _BOLD_FONT
 
     def add_sum_formulas(self, worksheet, columns: List[str], data_start_row: int,
                         data_end_row: int, totals_row: int, start_col: int = 1) -> None:
@@ -95,68 +290,144 @@ class ExcelUtilities:
 
             if col_idx == start_col:  # First column gets "Total" label
                 cell.value = "Total"
-                cell.font = Font(bold=True)
+                cell.font = _BOLD_FONT
             else:
                 # Add SUM formula for data range
-                column_letter = get_column_letter(col_idx)
+                column_letter = _column_letter(col_idx)
                 formula = f"=SUM({column_letter}{data_start_row}:{column_letter}{data_end_row})"
                 cell.value = formula
-                cell.font = Font(bold=True)
+                cell.font = _BOLD_FONT
 
     def apply_header_formatting(self, worksheet, headers: List[str], header_row: int = 1,
                                start_col: int = 1, bg_color: str = "366092",
                                font_color: str = "FFFFFF") -> None:
         """Apply professional formatting to header row."""
-        header_fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type="solid")
-        header_font = Font(color=font_color, bold=True)
-        header_alignment = Alignment(horizontal="center", vertical="center")
+        header_fill = _fill(bg_color)
+        header_font = _bold_font(font_color)
 
-        for col_idx in range(start_col, start_col + len(headers)):
-            header_cell = worksheet.cell(row=header_row, column=col_idx)
-            header_cell.fill = header_fill
-            header_cell.font = header_font
-            header_cell.alignment = header_alignment
+        for row in worksheet.iter_rows(min_row=header_row, max_row=header_row,
+                                       min_col=start_col, max_col=start_col + len(headers) - 1):
+            for header_cell in row:
+                header_cell.fill = header_fill
+                header_cell.font = header_font
+                header_cell.alignment = _HEADER_ALIGN
 
     def apply_data_formatting(self, worksheet, columns: List[str], data_start_row: int,
                              data_end_row: int, start_col: int = 1) -> None:
         """Apply formatting to data rows."""
-        data_alignment = Alignment(horizontal="left", vertical="center")
-
-        for row_idx in range(data_start_row, data_end_row):
-            for col_idx in range(start_col, start_col + len(columns)):
-                cell = worksheet.cell(row=row_idx, column=col_idx)
-                cell.alignment = data_alignment
+        # data_end_row is exclusive (it is the totals row)
+        for row in worksheet.iter_rows(min_row=data_start_row, max_row=data_end_row - 1,
+                                       min_col=start_col, max_col=start_col + len(columns) - 1):
+            for cell in row:
+                cell.alignment = _DATA_ALIGN
 
     def apply_totals_formatting(self, worksheet, columns: List[str], totals_row: int,
                                start_col: int = 1, bg_color: str = "E7E6E6") -> None:
         """Apply formatting to totals row."""
-        totals_fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type="solid")
+        totals_fill = _fill(bg_color)
 
-        for col_idx in range(start_col, start_col + len(columns)):
-            totals_cell = worksheet.cell(row=totals_row, column=col_idx)
-            totals_cell.fill = totals_fill
-            totals_cell.font = Font(bold=True)
+        for row in worksheet.iter_rows(min_row=totals_row, max_row=totals_row,
+                                       min_col=start_col, max_col=start_col + len(columns) - 1):
+            for totals_cell in row:
+                totals_cell.fill = totals_fill
+                totals_cell.font = _BOLD_FONT
 
     def apply_borders(self, worksheet, start_row: int, end_row: int,
                      start_col: int, end_col: int) -> None:
         """Apply borders to a range of cells."""
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-
-        for row_idx in range(start_row, end_row + 1):
-            for col_idx in range(start_col, end_col + 1):
-                cell = worksheet.cell(row=row_idx, column=col_idx)
-                cell.border = thin_border
+        for row in worksheet.iter_rows(min_row=start_row, max_row=end_row,
+                                       min_col=start_col, max_col=end_col):
+            for cell in row:
+                cell.border = _THIN_BORDER
+
+    def write_table(self, worksheet, columns: List[str], data_rows: List[Dict[str, Any]],
+                    totals: bool = True, formatted: bool = True) -> int:
+        """
+        Write a complete formatted table to a write-only worksheet in one pass.
+
+        Each cell is created with its value and styles in the same visit, and
+        totals are accumulated while the rows are written, instead of filling the
+        sheet first and walking it again for every formatting step. Column widths
+        must be set before calling this (see create_workbook).
+
+        Args:
+            worksheet: Write-only worksheet to append to
+            columns: Column names, also used as the header row
+            data_rows: Row dicts keyed by column name
+            totals: Add a "Total" row summing the numeric, non-ID columns
+            formatted: Align the data cells and border the whole table
+                       (the header row is always styled)
+
+        Returns:
+            int: The next available row after the table
+        """
+        # Each role is a named style registered on the workbook, so a cell takes its
+        # whole style in one assignment instead of hashing a font, fill, alignment
+        # and border into the workbook's style tables for every cell.
+        workbook = worksheet.parent
+        header_style = _table_style(workbook, "Header", formatted)
+
+        header_cells = []
+        for column_name in columns:
+            cell = WriteOnlyCell(worksheet, value=column_name)
+            cell.style = header_style
+            header_cells.append(cell)
+        worksheet.append(header_cells)
+
+        # ID columns are never totalled, so only the rest are checked per row
+        summed_columns = _summed_columns(columns) if totals else []
+        column_totals: Dict[str, float] = {}
+
+        # Every data cell has the same style, so it is resolved to the workbook's
+        # style array once and each cell is created with a copy of it (or, where
+        # that isn't available, takes the named style by assignment)
+        data_style = _table_style(workbook, "Data", True) if formatted else None
+        data_style_array = _style_array(worksheet, data_style) if data_style else None
+
+        for row_data in data_rows:
+            if data_style_array is not None:
+                row_cells = [
+                    Cell(worksheet, value=row_data.get(column_name), style_array=data_style_array)
+                    for column_name in columns
+                ]
+            elif data_style:
+                row_cells = []
+                for column_name in columns:
+                    cell = WriteOnlyCell(worksheet, value=row_data.get(column_name))
+                    cell.style = data_style
+                    row_cells.append(cell)
+            else:
+                row_cells = [row_data.get(column_name) for column_name in columns]
+            worksheet.append(row_cells)
+
+            for column_name in summed_columns:
+                value = row_data.get(column_name)
+                if isinstance(value, (int, float)):
+                    column_totals[column_name] = column_totals.get(column_name, 0.0) + value
+
+        next_row = len(data_rows) + 2
+        if not totals:
+            return next_row
+
+        totals_style = _table_style(workbook, "Totals", formatted)
+        totals_cells = []
+        for col_idx, column_name in enumerate(columns):
+            if col_idx == 0:  # First column gets "Total" label
+                value = "Total" if data_rows else None
+            else:
+                value = column_totals.get(column_name)
+            cell = WriteOnlyCell(worksheet, value=value)
+            cell.style = totals_style
+            totals_cells.append(cell)
+        worksheet.append(totals_cells)
+
+        return next_row + 1
 
     def auto_size_columns(self, worksheet, columns: List[str], start_col: int = 1,
                          default_width: int = 15) -> None:
         """Auto-size column widths."""
         for col_idx in range(start_col, start_col + len(columns)):
-            column_letter = get_column_letter(col_idx)
+            column_letter = _column_letter(col_idx)
             worksheet.column_dimensions[column_letter].width = default_width
 
     def save_to_buffer(self, workbook: openpyxl.Workbook) -> io.BytesIO:
@@ -188,108 +459,82 @@ class ExcelService:
         Each template gets its own custom generation logic.
         """
         try:
-            # Validate template exists
-            validation = template_service.validate_template(request.template_name)
+            # Validate template exists and is a readable xlsx archive (skips the full
+            # openpyxl load; the table structure it reads is cached per file)
+            validation = template_service.validate_template(request.template_name, fast=True)
             if not validation["valid"]:
-                return ReportResponse(
-                    success=False,
-                    data={},
-                    message=validation["error"],
-                    file_data=None
-                )
+                return _error_response(validation["error"])
 
             # Route to template-specific generator
             template_name = request.template_name.lower()
 
             if template_name == "template-1.xlsx":
-                return self._generate_template_1_report(request)
+                return self._generate_template_1_report(request, validation["template_info"])
             else:
                 # Default/fallback generator for unknown templates
                 return self._generate_generic_report(request)
 
         except Exception as e:
             logger.error(f"Error generating report: {e}")
-            return ReportResponse(
-                success=False,
-                data={},
-                message=f"Error generating report: {str(e)}",
-                file_data=None
-            )
+            return _error_response(f"Error generating report: {str(e)}")
 
-    def _generate_template_1_report(self, request: ReportRequest) -> ReportResponse:
+    def _generate_template_1_report(self, request: ReportRequest,
+                                    template_info: Optional[TemplateInfo]) -> ReportResponse:
         """
         Template-specific generator for Template-1.xlsx
         This can be as custom/weird as needed for this specific template.
+
+        template_info is the template structure found while validating the template.
         """
         try:
-            # Get template structure
-            templates_response = template_service.list_templates()
-            template_info = None
-            for template in templates_response.data["templates"]:
-                if template.filename == request.template_name:
-                    template_info = template
-                    break
-
             if not template_info:
-                return ReportResponse(
-                    success=False,
-                    data={},
-                    message=f"Template {request.template_name} not found",
-                    file_data=None
-                )
+                return _error_response(f"Template {request.template_name} not found")
 
             # CREATE CUSTOM LOGIC FOR TEMPLATE-1 HERE
-            workbook = self.utils.create_workbook("Financial Report")
+            workbook = self.utils.create_workbook("Financial Report", streaming=True)
             worksheet = workbook.active
 
             # Your specific Template-1 columns
             columns = template_info.columns
-            rows_data = request.data.get("rows", [])
-
-            # Custom layout for Template-1
-            self.utils.add_headers(worksheet, columns, row=1)
-            self.utils.populate_data_rows(worksheet, rows_data, columns, start_row=2)
-
-            # For Template-1: Use calculated totals (since it has SUM formulas)
-            # You can switch this to add_sum_formulas if your template uses Excel formulas
-            totals_row = len(rows_data) + 2
-            self.utils.add_calculated_totals_row(worksheet, columns, rows_data, totals_row)
-
-            # Apply Template-1 specific formatting (always formatted for Template-1)
-            self.utils.apply_header_formatting(worksheet, columns)
-            self.utils.apply_data_formatting(worksheet, columns, 2, totals_row)
-            self.utils.apply_totals_formatting(worksheet, columns, totals_row)
-            self.utils.apply_borders(worksheet, 1, totals_row, 1, len(columns))
+            rows_data = request.data.get("rows", ())
+
+            # Column widths must be set before any row is written to a write-only sheet
             self.utils.auto_size_columns(worksheet, columns)
 
+            # Custom layout for Template-1: formatted headers, bordered data rows and
+            # a calculated totals row, all written in a single pass.
+            # Use add_sum_formulas on a regular workbook instead if the totals should
+            # be Excel formulas.
+            self.utils.write_table(worksheet, columns, rows_data)
+
             # Generate file
             excel_buffer = self.utils.save_to_buffer(workbook)
+            # getvalue() copies the whole buffer, so take the bytes once
+            file_data = excel_buffer.getvalue()
 
-            # Create response
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Create response (built here from known-good values, so validation is skipped)
+            # One clock read for the filename, the metadata and the response timestamp
+            now = datetime.now(timezone.utc)
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             output_filename = f"template_1_report_{timestamp}.xlsx"
 
-            return ReportResponse(
+            return ReportResponse.model_construct(
                 success=True,
                 data={
                     "filename": output_filename,
-                    "size": len(excel_buffer.getvalue()),
+                    "size": len(file_data),
                     "template_used": request.template_name,
-                    "generated_at": datetime.now().isoformat(),
+                    "generated_at": now.isoformat(),
                     "rows_processed": len(rows_data)
                 },
                 message="Template-1 report generated successfully",
-                file_data=excel_buffer.getvalue()
+                timestamp=now,
+                file_data=file_data
             )
 
         except Exception as e:
             logger.error(f"Error generating Template-1 report: {e}")
-            return ReportResponse(
-                success=False,
-                data={},
-                message=f"Error generating Template-1 report: {str(e)}",
-                file_data=None
-            )
+            return _error_response(f"Error generating Template-1 report: {str(e)}")
 
     def _generate_generic_report(self, request: ReportRequest) -> ReportResponse:
         """
@@ -297,57 +542,50 @@ class ExcelService:
         Keep this simple - complex templates should get their own generator.
         """
         try:
-            # Very basic generation for unknown templates
-            workbook = self.utils.create_workbook("Report")
-            worksheet = workbook.active
-
             # Try to extract some basic info
-            rows_data = request.data.get("rows", [])
+            rows_data = request.data.get("rows", ())
             if not rows_data:
-                return ReportResponse(
-                    success=False,
-                    data={},
-                    message="No data provided for report generation",
-                    file_data=None
-                )
+                return _error_response("No data provided for report generation")
 
             # Use first row keys as columns
             columns = list(rows_data[0].keys()) if rows_data else []
 
-            # Basic layout
-            self.utils.add_headers(worksheet, columns)
-            next_row = self.utils.populate_data_rows(worksheet, rows_data, columns, start_row=2)
+            # Very basic generation for unknown templates, streamed row by row
+            workbook = self.utils.create_workbook("Report", streaming=True)
+            worksheet = workbook.active
 
-            # Basic formatting
-            self.utils.apply_header_formatting(worksheet, columns)
+            # Column widths must be set before any row is written to a write-only sheet
             self.utils.auto_size_columns(worksheet, columns)
 
+            # Basic layout: formatted headers, plain data rows
+            self.utils.write_table(worksheet, columns, rows_data, totals=False, formatted=False)
+
             excel_buffer = self.utils.save_to_buffer(workbook)
+            # getvalue() copies the whole buffer, so take the bytes once
+            file_data = excel_buffer.getvalue()
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # One clock read for the filename, the metadata and the response timestamp
+            now = datetime.now(timezone.utc)
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             output_filename = f"generic_report_{timestamp}.xlsx"
 
-            return ReportResponse(
+            return ReportResponse.model_construct(
                 success=True,
                 data={
                     "filename": output_filename,
-                    "size": len(excel_buffer.getvalue()),
+                    "size": len(file_data),
                     "template_used": request.template_name,
-                    "generated_at": datetime.now().isoformat(),
+                    "generated_at": now.isoformat(),
                     "rows_processed": len(rows_data)
                 },
                 message="Generic report generated successfully",
-                file_data=excel_buffer.getvalue()
+                timestamp=now,
+                file_data=file_data
             )
 
         except Exception as e:
             logger.error(f"Error generating generic report: {e}")
-            return ReportResponse(
-                success=False,
-                data={},
-                message=f"Error generating generic report: {str(e)}",
-                file_data=None
-            )
+            return _error_response(f"Error generating generic report: {str(e)}")
 
 
 # Global instance
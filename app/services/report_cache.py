@@ -0,0 +1,115 @@
+"""
+In-memory cache for generated Excel reports.
+Identical report requests (same template, same payload) reuse the workbook
+generated the first time instead of rendering it again.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.reports import ReportResponse
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class ReportCache:
+    """
+    LRU cache of successful report responses with a time-to-live.
+
+    Each entry holds a complete workbook, so besides the entry count the cache is
+    bounded by the total size of the cached files (`max_bytes`), and a report
+    larger than `max_entry_bytes` is never cached. A limit of 0 means unbounded.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, max_bytes: int = 0, max_entry_bytes: int = 0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        # key -> (expiry, response, file size in bytes)
+        self._entries: "OrderedDict[str, Tuple[float, ReportResponse, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        logger.info("Report cache initialized (maxsize=%d, ttl=%ss, max_bytes=%d)", maxsize, ttl, max_bytes)
+
+    @staticmethod
+    def make_key(template_name: str, data: Dict[str, Any]) -> str:
+        """Build a cache key from the template name and a canonical form of the data."""
+        payload = orjson.dumps(data, option=orjson.OPT_SORT_KEYS, default=str)
+        digest = hashlib.sha256(payload).hexdigest()
+        return f"{template_name}:{digest}"
+
+    def get(self, key: str) -> Optional[ReportResponse]:
+        """Return the cached response for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            if entry is not None:
+                # Expired
+                self._bytes -= self._entries.pop(key)[2]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, response: ReportResponse) -> None:
+        """Store a response, evicting the least recently used entries when full."""
+        if self.maxsize <= 0:
+            return
+
+        size = len(response.file_data or b"")
+        if self.max_entry_bytes and size > self.max_entry_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (time.monotonic() + self.ttl, response, size)
+            self._bytes += size
+            while len(self._entries) > self.maxsize or (self.max_bytes and self._bytes > self.max_bytes):
+                self._bytes -= self._entries.popitem(last=False)[1][2]
+
+    def clear(self) -> None:
+        """Drop all cached responses and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl
+            }
+
+
+# Global instance
+report_cache = ReportCache(
+    maxsize=settings.report_cache_size,
+    ttl=settings.report_cache_ttl,
+    max_bytes=settings.report_cache_max_bytes,
+    max_entry_bytes=settings.report_cache_max_entry_bytes
+)
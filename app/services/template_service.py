@@ -3,12 +3,18 @@ Template management service for Excel API.
 Handles template discovery, validation, and metadata extraction.
 """
 
+import hashlib
 import os
+import re
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timezone
+from xml.etree import ElementTree
 import openpyxl
-from openpyxl.worksheet.table import Table
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
@@ -17,6 +23,31 @@ from app.models.templates import TemplateInfo, TemplateListResponse
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Namespace of the SpreadsheetML parts inside an xlsx archive
+_SPREADSHEETML_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+# An empty zip archive is 22 bytes (just the end-of-central-directory record)
+_MIN_ZIP_SIZE = 22
+
+# Classifies a column by the keywords in its name, in one case-insensitive pass.
+# Each branch is a lookahead anchored at the start, so the alternatives are tried
+# in priority order (an "amount id" column is still an ID column):
+#   ID columns, group/category columns (before the amount check),
+#   financial/numeric columns, difference/variance columns
+_COLUMN_KIND_RE = re.compile(
+    r"^(?:(?=.*id)(?P<id>)"
+    r"|(?=.*(?:group|center|category|type))(?P<group>)"
+    r"|(?=.*(?:amount|rate|cost|price|total))(?P<amount>)"
+    r"|(?=.*(?:diff|variance|delta))(?P<diff>))",
+    re.IGNORECASE | re.DOTALL
+)
+_SAMPLE_VALUES = {
+    "id": "RULE001",
+    "group": "Sample Group",
+    "amount": 1000.50,
+    "diff": 0.0,
+}
+
 
 class TemplateService:
     """Service for managing Excel templates."""
@@ -24,6 +55,19 @@ class TemplateService:
     def __init__(self):
         self.templates_dir = Path(settings.templates_dir)
         self.templates_dir.mkdir(exist_ok=True)
+        # Parsed template metadata keyed by path, stored with the (mtime_ns, size)
+        # it was read at so unchanged templates skip the openpyxl round-trip
+        self._template_cache: Dict[str, Tuple[int, int, TemplateInfo]] = {}
+        # Result of validate_template's open check (error message or None), keyed the same way
+        self._validation_cache: Dict[str, Tuple[int, int, Optional[str]]] = {}
+        self._template_cache_lock = threading.Lock()
+        # Template files found by the last directory scan, stored with the directory
+        # and its mtime_ns (adding, removing or renaming a file changes the mtime)
+        self._template_files: Optional[Tuple[Path, int, List[Path]]] = None
+        # Threads are only started once there is more than one template to scan
+        self._scan_executor = ThreadPoolExecutor(
+            max_workers=settings.template_scan_workers, thread_name_prefix="template-scan"
+        )
         logger.info(f"Template service initialized with directory: {self.templates_dir}")
 
     def list_templates(self) -> TemplateListResponse:
@@ -34,18 +78,18 @@ class TemplateService:
             TemplateListResponse: List of available templates
         """
         try:
-            templates = []
+            file_paths = self.find_template_files()
 
-            # Find all Excel files in templates directory
-            excel_files = list(self.templates_dir.glob("*.xlsx")) + list(self.templates_dir.glob("*.xls"))
+            # Opening workbooks is mostly zip and XML I/O, so templates are scanned
+            # in parallel (cached ones return straight away). A template that fails
+            # comes back as None instead of failing the whole listing.
+            if len(file_paths) > 1:
+                scanned = self._scan_executor.map(self.scan_one_template, file_paths)
+            else:
+                scanned = map(self.scan_one_template, file_paths)
+            templates = [template_info for template_info in scanned if template_info is not None]
 
-            for file_path in excel_files:
-                try:
-                    template_info = self._get_template_info(file_path)
-                    templates.append(template_info)
-                except Exception as e:
-                    logger.warning(f"Could not process template {file_path.name}: {e}")
-                    continue
+            self._expire_template_cache(file_paths)
 
             logger.info(f"Found {len(templates)} valid templates")
 
@@ -63,6 +107,114 @@ class TemplateService:
                 message=f"Error listing templates: {str(e)}"
             )
 
+    def find_template_files(self) -> List[Path]:
+        """
+        Find all Excel files in the templates directory.
+
+        The directory is only scanned again once its mtime changes, so an
+        unchanged directory costs a single stat.
+
+        Returns:
+            List of template file paths
+        """
+        templates_dir = self.templates_dir
+        mtime_ns = templates_dir.stat().st_mtime_ns
+        cached = self._template_files
+        if cached is not None and cached[0] == templates_dir and cached[1] == mtime_ns:
+            return list(cached[2])
+
+        file_paths = list(templates_dir.glob("*.xlsx")) + list(templates_dir.glob("*.xls"))
+        self._template_files = (templates_dir, mtime_ns, file_paths)
+        return list(file_paths)
+
+    def get_templates_etag(self) -> str:
+        """
+        Build a weak ETag that changes whenever a template is added, removed or modified.
+
+        Only stats the files, so it is far cheaper than listing the templates.
+
+        Returns:
+            Weak ETag header value
+        """
+        fingerprint = sorted(
+            (path.name, stat.st_mtime_ns, stat.st_size)
+            for path in self.find_template_files()
+            for stat in (path.stat(),)
+        )
+        digest = hashlib.md5(repr(fingerprint).encode("utf-8")).hexdigest()
+        return f'W/"{digest}"'
+
+    def get_template_info(self, filename: str) -> Optional[TemplateInfo]:
+        """
+        Get metadata for a single template by filename.
+
+        Only that one file is examined, and the cached metadata is reused while
+        it is unchanged.
+
+        Args:
+            filename: Name of the template file
+
+        Returns:
+            TemplateInfo, or None if the template does not exist or could not be processed
+        """
+        template_path = self.get_template_path(filename)
+        if template_path is None:
+            return None
+        return self.scan_one_template(template_path)
+
+    def scan_one_template(self, file_path: Path) -> Optional[TemplateInfo]:
+        """
+        Extract metadata for a single template, without failing the whole listing.
+
+        Args:
+            file_path: Path to the Excel file
+
+        Returns:
+            TemplateInfo, or None if the template could not be processed
+        """
+        try:
+            return self._get_cached_template_info(file_path)
+        except Exception as e:
+            logger.warning(f"Could not process template {file_path.name}: {e}")
+            return None
+
+    def _get_cached_template_info(self, file_path: Path) -> TemplateInfo:
+        """
+        Get template metadata, reusing the cached copy while the file is unchanged.
+
+        Args:
+            file_path: Path to the Excel file
+
+        Returns:
+            TemplateInfo: Template metadata
+        """
+        stat = file_path.stat()
+        key = str(file_path)
+
+        with self._template_cache_lock:
+            cached = self._template_cache.get(key)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        template_info = self._get_template_info(file_path)
+        with self._template_cache_lock:
+            self._template_cache[key] = (stat.st_mtime_ns, stat.st_size, template_info)
+        return template_info
+
+    def _expire_template_cache(self, file_paths: List[Path]) -> None:
+        """
+        Drop cached metadata and validation results for templates that are no longer on disk.
+
+        Args:
+            file_paths: Template files found by the latest scan
+        """
+        current = {str(path) for path in file_paths}
+        with self._template_cache_lock:
+            for key in self._template_cache.keys() - current:
+                del self._template_cache[key]
+            for key in self._validation_cache.keys() - current:
+                del self._validation_cache[key]
+
     def _get_template_info(self, file_path: Path) -> TemplateInfo:
         """
         Extract metadata from an Excel template file.
@@ -82,7 +234,7 @@ class TemplateService:
             name=file_path.stem.replace("_", " ").replace("-", " ").title(),
             filename=file_path.name,
             size=stat.st_size,
-            last_modified=datetime.fromtimestamp(stat.st_mtime),
+            last_modified=datetime.fromtimestamp(stat.st_mtime, timezone.utc),
             description=f"Excel template with {table_info.get('tables', 0)} table(s)",
             columns=table_info.get('columns', []),
             sample_data=table_info.get('sample_data', {})
@@ -97,90 +249,115 @@ class TemplateService:
 
         Returns:
             Dict containing structure information
+
+        Raises:
+            zipfile.BadZipFile, KeyError, ElementTree.ParseError: If the file is not a readable xlsx archive
         """
         try:
-            workbook = openpyxl.load_workbook(file_path, data_only=False)
-            worksheet = workbook.active
-
-            # Look for Excel tables
-            tables = worksheet.tables
-            columns = []
-            sample_data = {}
-
-            if tables:
-                # Get columns from first table
-                table_name = list(tables.keys())[0]
-                table = tables[table_name]
-
-                # Extract headers from table range
-                min_col, min_row, max_col, _ = openpyxl.utils.range_boundaries(table.ref)
-
-                for col in range(min_col, max_col + 1):
-                    header_cell = worksheet.cell(row=min_row, column=col)
-                    if header_cell.value:
-                        column_name = str(header_cell.value).strip()
-                        columns.append(column_name)
+            # Table definitions are small standalone XML parts, so they are read
+            # straight from the zip instead of loading the whole workbook
+            table_names, columns = self._read_table_columns(file_path)
 
-                        # Generate sample data based on column name
-                        sample_data[column_name] = self._generate_sample_value(column_name)
-
-                logger.info(f"Found table '{table_name}' with columns: {columns}")
+            if table_names:
+                logger.info(f"Found table '{table_names[0]}' with columns: {columns}")
 
             else:
                 # No tables found, try to detect headers in first row
-                for col in range(1, 20):  # Check first 20 columns
-                    header_cell = worksheet.cell(row=1, column=col)
-                    if header_cell.value:
-                        column_name = str(header_cell.value).strip()
-                        columns.append(column_name)
-                        sample_data[column_name] = self._generate_sample_value(column_name)
-                    else:
-                        break
+                columns = self._read_header_row(file_path)
 
                 logger.info(f"Found header row with columns: {columns}")
 
-            workbook.close()
+            # Generate sample data based on column name
+            sample_data = {column_name: self._generate_sample_value(column_name) for column_name in columns}
 
             return {
-                "tables": len(tables),
+                "tables": len(table_names),
                 "columns": columns,
                 "sample_data": sample_data
             }
 
+        except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+            # Not a readable xlsx archive at all: this is not a usable template,
+            # so let the caller (validate_template) report it
+            raise
         except Exception as e:
             logger.warning(f"Could not analyze Excel structure for {file_path.name}: {e}")
             return {"tables": 0, "columns": [], "sample_data": {}}
 
-    def _generate_sample_value(self, column_name: str) -> Any:
+    def _read_table_columns(self, file_path: Path) -> Tuple[List[str], List[str]]:
         """
-        Generate appropriate sample data based on column name.
+        Read the Excel table definitions (xl/tables/*.xml) from the xlsx archive.
 
         Args:
-            column_name: Name of the column
+            file_path: Path to Excel file
 
         Returns:
-            Sample value appropriate for the column type
+            Tuple of (table names in workbook order, column names of the first table)
         """
-        column_lower = column_name.lower()
+        with zipfile.ZipFile(file_path) as archive:
+            table_parts = sorted(
+                (name for name in archive.namelist()
+                 if name.startswith("xl/tables/") and name.endswith(".xml")),
+                key=lambda name: (len(name), name)
+            )
+            tables = [ElementTree.fromstring(archive.read(name)) for name in table_parts]
 
-        # ID columns
-        if 'id' in column_lower:
-            return "RULE001"
+        if not tables:
+            return [], []
 
-        # Group/category columns (before amount check)
-        if any(keyword in column_lower for keyword in ['group', 'center', 'category', 'type']):
-            return "Sample Group"
+        table_names = [table.get("displayName") or table.get("name") or "" for table in tables]
+        columns = [
+            column_name.strip()
+            for table_column in tables[0].iter(f"{_SPREADSHEETML_NS}tableColumn")
+            if (column_name := table_column.get("name", "")).strip()
+        ]
+        return table_names, columns
 
-        # Financial/numeric columns
-        if any(keyword in column_lower for keyword in ['amount', 'rate', 'cost', 'price', 'total']):
-            return 1000.50
+    def _read_header_row(self, file_path: Path) -> List[str]:
+        """
+        Read the header names from the first row of the active sheet.
 
-        # Difference/variance columns
-        if any(keyword in column_lower for keyword in ['diff', 'variance', 'delta']):
-            return 0.0
+        Uses a read-only (streaming) workbook and stops at the first empty cell.
 
-        # Default to string
-        return "Sample Value"
+        Args:
+            file_path: Path to Excel file
+
+        Returns:
+            Column names found in the first row
+        """
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        try:
+            columns = []
+            # Check first 19 columns
+            for header_row in workbook.active.iter_rows(min_row=1, max_row=1, max_col=19, values_only=True):
+                for value in header_row:
+                    if not value:
+                        break
+                    columns.append(str(value).strip())
+            return columns
+        finally:
+            workbook.close()
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _generate_sample_value(column_name: str) -> Any:
+        """
+        Generate appropriate sample data based on column name.
+
+        Cached because the same column names recur across templates.
+
+        Args:
+            column_name: Name of the column
+
+        Returns:
+            Sample value appropriate for the column type
+        """
+        match = _COLUMN_KIND_RE.match(column_name)
+        kind = match.lastgroup if match is not None else None
+        if kind is None:
+            # Default to string
+            return "Sample Value"
+        return _SAMPLE_VALUES[kind]
 
     def get_template_path(self, filename: str) -> Optional[Path]:
         """
@@ -199,15 +376,22 @@ class TemplateService:
 
         return None
 
-    def validate_template(self, filename: str) -> Dict[str, Any]:
+    def validate_template(self, filename: str, fast: bool = False) -> Dict[str, Any]:
         """
         Validate that a template file exists and is accessible.
 
+        The open check is remembered per file until it changes on disk, and the
+        template's metadata is returned along with the result so callers don't
+        have to look it up again.
+
         Args:
             filename: Name of the template file
+            fast: Skip opening the workbook with openpyxl; only check the file on disk
+                  and read its (cached) table structure, which still rejects files
+                  that are not xlsx archives
 
         Returns:
-            Dict with validation results
+            Dict with validation results (including "template_info" when valid)
         """
         template_path = self.get_template_path(filename)
 
@@ -217,23 +401,58 @@ class TemplateService:
                 "error": f"Template '{filename}' not found"
             }
 
-        try:
-            # Try to open the file
-            workbook = openpyxl.load_workbook(template_path)
-            workbook.close()
-
+        stat = template_path.stat()
+        key = str(template_path)
+
+        if fast:
+            if stat.st_size <= _MIN_ZIP_SIZE:
+                return {
+                    "valid": False,
+                    "error": f"Cannot open template '{filename}': file is too small to be a workbook"
+                }
+            try:
+                template_info = self._get_cached_template_info(template_path)
+            except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+                return {
+                    "valid": False,
+                    "error": f"Cannot open template '{filename}': {e}"
+                }
             return {
                 "valid": True,
-                "path": str(template_path),
-                "size": template_path.stat().st_size
+                "path": key,
+                "size": stat.st_size,
+                "template_info": template_info
             }
 
-        except Exception as e:
+        with self._template_cache_lock:
+            cached = self._validation_cache.get(key)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            open_error = cached[2]
+        else:
+            try:
+                # Try to open the file
+                workbook = openpyxl.load_workbook(template_path)
+                workbook.close()
+                open_error = None
+            except Exception as e:
+                open_error = str(e)
+
+            with self._template_cache_lock:
+                self._validation_cache[key] = (stat.st_mtime_ns, stat.st_size, open_error)
+
+        if open_error is not None:
             return {
                 "valid": False,
-                "error": f"Cannot open template '{filename}': {str(e)}"
+                "error": f"Cannot open template '{filename}': {open_error}"
             }
 
+        return {
+            "valid": True,
+            "path": key,
+            "size": stat.st_size,
+            "template_info": self.scan_one_template(template_path)
+        }
+
 
 # Global instance
 template_service = TemplateService()
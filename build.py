@@ -2,54 +2,167 @@
 """
 Build validation script for the Python Excel API.
 This is like 'npm run build' for TypeScript projects.
+
+Python checks run in this process instead of spawning a fresh interpreter
+for each one, and all checks run concurrently; only external tools go
+through run_command.
 """
 
+import contextlib
+import importlib
+import logging
+import logging.handlers
+import py_compile
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def run_command(cmd, description):
-    """Run a command and return success status."""
-    print(f"🔍 {description}...")
+# Files checked for syntax errors
+SYNTAX_CHECK_FILES = ["app/main.py", "app/models/reports.py", "app/api/reports.py"]
+
+MYPY_ARGS = ["app", "--ignore-missing-imports", "--no-error-summary"]
+
+# Title the FastAPI app is expected to be created with
+APP_TITLE = "Python Excel API"
+
+
+def run_command(cmd):
+    """Run an external command, raising with its error output if it fails.
+
+    Args:
+        cmd: Argument list; it is executed directly, without a shell
+    """
+    result = subprocess.run(cmd, capture_output=True, text=True, cwd=Path.cwd())
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or result.stdout.strip())
+
+
+def run_check(check):
+    """Run a check and return (success, error message).
+
+    A check passes by returning normally and fails by raising. Nothing is
+    printed here so checks can run concurrently without interleaving output.
+    """
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, cwd=Path.cwd())
-        if result.returncode == 0:
-            print(f"✅ {description} - PASSED")
-            return True
-        else:
-            print(f"❌ {description} - FAILED")
-            print(f"   Error: {result.stderr.strip()}")
-            return False
+        check()
+        return True, ""
     except Exception as e:
-        print(f"❌ {description} - ERROR: {e}")
-        return False
+        return False, str(e)
+
+
+@contextlib.contextmanager
+def capture_app_logging():
+    """Collect the app's log records in memory instead of printing them.
+
+    The app's console handler is detached from its logger and a buffering
+    handler on the root logger takes every record (the app's own loggers and
+    anything else that logs during the import). Only logging is touched;
+    sys.stdout and sys.stderr stay as they are, so output from other threads
+    is unaffected.
+
+    Yields:
+        logging.handlers.BufferingHandler: Holds the captured records in .buffer
+    """
+    # Importing app.core.logging configures the app logger and logs nothing itself
+    importlib.import_module("app.core.logging")
+    app_logger = logging.getLogger("excel_api")
+    root_logger = logging.getLogger()
+
+    capture = logging.handlers.BufferingHandler(capacity=10_000)
+    app_handlers = app_logger.handlers[:]
+    app_logger.handlers = []
+    root_logger.addHandler(capture)
+    try:
+        yield capture
+    finally:
+        root_logger.removeHandler(capture)
+        app_logger.handlers = app_handlers
+
+
+def validate_app_import():
+    """Import the application (like TypeScript compilation) and check the FastAPI app.
+
+    The app module graph is imported once per build and the FastAPI instance is
+    inspected in the same process.
+    """
+    # Importing the app sets up logging and services, which log to the console;
+    # keep that out of the build output like a captured subprocess would
+    with capture_app_logging():
+        main_module = importlib.import_module("app.main")
+    if not hasattr(main_module, "app"):
+        raise RuntimeError("app.main does not define 'app'")
+    if main_module.app.title != APP_TITLE:
+        raise RuntimeError(f"Unexpected app title: {main_module.app.title!r}")
+
+
+def check_syntax():
+    """Compile the core modules to catch syntax errors.
+
+    Every file is compiled on every build: it takes milliseconds for these few
+    files, and skipping files with fresh bytecode would skip all of them once
+    the import check has imported (and so byte-compiled) the app.
+    """
+    for path in SYNTAX_CHECK_FILES:
+        py_compile.compile(path, doraise=True)
+
+
+def check_types():
+    """Type check the app package with mypy (like the TypeScript compiler).
+
+    Runs in-process through mypy's API when mypy is importable here,
+    otherwise through whichever mypy is on the PATH.
+    """
+    try:
+        from mypy import api as mypy_api
+    except ImportError:
+        mypy_path = shutil.which("mypy")
+        if mypy_path is None:
+            raise RuntimeError("mypy: not found")
+        run_command([mypy_path, *MYPY_ARGS])
+        return
+
+    stdout, stderr, exit_status = mypy_api.run(MYPY_ARGS)
+    if exit_status != 0:
+        raise RuntimeError((stderr or stdout).strip())
+
 
 def main():
     """Run all validation checks."""
     print("🏗️  Building Python Excel API...")
     print("=" * 50)
 
+    # Import validation also covers FastAPI app creation, so the app is imported once
     checks = [
-        # Import validation (like TypeScript compilation)
-        ("python -c \"import app.main; print('All imports successful')\"", "Import validation"),
+        (validate_app_import, "Import validation"),
+        (check_syntax, "Syntax validation"),
+        (check_types, "Type checking"),
+    ]
+    (import_check, _), concurrent_checks = checks[0], checks[1:]
 
-        # Syntax checking
-        ("python -m py_compile app/main.py app/models/reports.py app/api/reports.py", "Syntax validation"),
+    print(f"🔍 Running {len(checks)} checks...")
+    # The import check swaps the app's log handlers while it runs, so it runs on
+    # the main thread before the other checks start.
+    results = [run_check(import_check)]
 
-        # Type checking (like TypeScript compiler)
-        ("mypy app --ignore-missing-imports --no-error-summary", "Type checking"),
-
-        # FastAPI schema validation
-        ("python -c \"from app.main import app; print('FastAPI app created successfully')\"", "FastAPI validation"),
-    ]
+    # The remaining checks are independent, so they run concurrently and take
+    # about as long as the slowest one (usually mypy) instead of their sum.
+    # Results are printed afterwards, in the order above.
+    with ThreadPoolExecutor(max_workers=len(concurrent_checks)) as executor:
+        futures = [executor.submit(run_check, check) for check, _ in concurrent_checks]
+    results += [future.result() for future in futures]
 
     passed = 0
     failed = 0
 
-    for cmd, description in checks:
-        if run_command(cmd, description):
+    for (_, description), (success, error) in zip(checks, results):
+        if success:
+            print(f"✅ {description} - PASSED")
             passed += 1
         else:
+            print(f"❌ {description} - FAILED")
+            print(f"   Error: {error}")
             failed += 1
 
     print("\n" + "=" * 50)
@@ -62,5 +175,6 @@ def main():
         print("💥 BUILD FAILED - Fix the errors above")
         return 1
 
+
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Shared pytest fixtures.
+
+Fixtures defined here are available to every test module without importing them
+(similar to a shared setup file in Jest).
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client for the FastAPI app (like supertest for Express).
+
+    Created once per test session (once per worker under pytest-xdist), and used
+    as a context manager so the app's lifespan startup/shutdown runs exactly once.
+    """
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def openapi_schema(client):
+    """The app's OpenAPI schema, fetched once per session.
+
+    Building the schema reflects every route and model, so tests that inspect
+    it share this dict instead of requesting /openapi.json themselves.
+    """
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture(scope="session")
+def template_service():
+    """A TemplateService shared by tests that only read from it.
+
+    Tests that swap its templates directory or assert on a cold cache should
+    build their own instance instead.
+    """
+    from app.services.template_service import TemplateService
+
+    return TemplateService()
+
+
+@pytest.fixture(scope="session")
+def excel_utils():
+    """Shared ExcelUtilities (stateless, so safe to reuse across tests)."""
+    from app.services.excel_service import ExcelUtilities
+
+    return ExcelUtilities()
+
+
+@pytest.fixture(scope="session")
+def excel_service():
+    """Shared ExcelService (it keeps no per-report state)."""
+    from app.services.excel_service import ExcelService
+
+    return ExcelService()
+
+
+@pytest.fixture(scope="session")
+def shared_tmpdir(tmp_path_factory):
+    """One scratch directory for the whole session (one per worker under xdist).
+
+    Tests name their files after themselves (request.node.name) so they never collide.
+    Use tmp_path instead when a test needs the directory to itself.
+    """
+    return tmp_path_factory.mktemp("xlsx", numbered=False)
@@ -6,12 +6,8 @@ Like testing Express app.js setup and basic routes.
 """
 
 import pytest
-from fastapi.testclient import TestClient
 from app.main import app
 
-# Create test client for FastAPI app (like supertest for Express)
-client = TestClient(app)
-
 
 class TestMainApplication:
     """Test the main FastAPI application setup and basic endpoints."""
@@ -22,7 +18,7 @@ class TestMainApplication:
         assert app.version == "1.0.0"
         assert app.description == "Python API for Excel report generation from templates"
 
-    def test_root_endpoint(self):
+    def test_root_endpoint(self, client):
         """Test the root endpoint returns correct information."""
         response = client.get("/")
 
@@ -41,7 +37,7 @@ class TestMainApplication:
         assert data["data"]["docs"] == "/docs"
         assert data["data"]["health"] == "/api/health"
 
-    def test_health_endpoint(self):
+    def test_health_endpoint(self, client):
         """Test the health check endpoint."""
         response = client.get("/api/health")
 
@@ -61,14 +57,14 @@ class TestMainApplication:
         assert "debug" in data["data"]
         assert "timestamp" in data["data"]
 
-    def test_docs_endpoint_exists(self):
+    def test_docs_endpoint_exists(self, client):
         """Test that the API documentation endpoint is available."""
         response = client.get("/docs")
         assert response.status_code == 200
         # Swagger UI should return HTML
         assert "text/html" in response.headers["content-type"]
 
-    def test_404_error_handling(self):
+    def test_404_error_handling(self, client):
         """Test that 404 errors are handled correctly."""
         response = client.get("/nonexistent-endpoint")
 
@@ -79,7 +75,7 @@ class TestMainApplication:
         assert "detail" in data
         assert data["detail"] == "Not Found"
 
-    def test_cors_headers(self):
+    def test_cors_headers(self, client):
         """Test that CORS headers are properly set."""
         response = client.options("/api/health")
 
@@ -88,7 +84,7 @@ class TestMainApplication:
         # by checking that our endpoint works (CORS would block if misconfigured)
         assert response.status_code in [200, 405]  # OPTIONS might not be implemented
 
-    def test_request_logging_middleware(self):
+    def test_request_logging_middleware(self, client):
         """Test that request logging middleware is working."""
         # Make a request that should be logged
         response = client.get("/api/health")
@@ -98,11 +94,22 @@ class TestMainApplication:
         # but we can verify the request completes successfully
         # which means the middleware isn't breaking anything
 
+    def test_request_log_structured_fields(self, client, caplog):
+        """Test that request log records carry structured fields."""
+        with caplog.at_level("INFO", logger="excel_api.requests"):
+            client.get("/api/health")
+
+        record = next(r for r in caplog.records if r.name == "excel_api.requests")
+        assert record.method == "GET"
+        assert record.path == "/api/health"
+        assert record.status == 200
+        assert record.duration_ms >= 0
+
 
 class TestErrorHandling:
     """Test error handling and exception scenarios."""
 
-    def test_http_exception_format(self):
+    def test_http_exception_format(self, client):
         """Test that HTTP exceptions are handled correctly."""
         response = client.get("/api/nonexistent")
 
@@ -113,7 +120,7 @@ class TestErrorHandling:
         assert "detail" in data
         assert data["detail"] == "Not Found"
 
-    def test_general_exception_handling(self):
+    def test_general_exception_handling(self, client):
         """Test that unexpected exceptions are handled gracefully."""
         # This would test the general exception handler,
         # but we'd need to inject an error to trigger it.
@@ -129,18 +136,14 @@ class TestErrorHandling:
 class TestAPIDocumentation:
     """Test API documentation endpoints."""
 
-    def test_openapi_schema(self):
+    def test_openapi_schema(self, openapi_schema):
         """Test that OpenAPI schema is available."""
-        response = client.get("/openapi.json")
-        assert response.status_code == 200
-
-        schema = response.json()
-        assert "openapi" in schema
-        assert "info" in schema
-        assert schema["info"]["title"] == "Python Excel API"
-        assert schema["info"]["version"] == "1.0.0"
+        assert "openapi" in openapi_schema
+        assert "info" in openapi_schema
+        assert openapi_schema["info"]["title"] == "Python Excel API"
+        assert openapi_schema["info"]["version"] == "1.0.0"
 
-    def test_redoc_documentation(self):
+    def test_redoc_documentation(self, client):
         """Test that ReDoc documentation is available."""
         response = client.get("/redoc")
         assert response.status_code == 200